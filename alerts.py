@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+# ================= OPERATORS =================
+OPS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+}
+
+# flag tiap baris dikodekan sebagai bitmask uint64
+MAX_RULES = 64
+
+# ================= DEFAULT RULES =================
+# threshold rule   -> {"name", "label", "column", "op", "value"}
+# combination rule -> {"name", "label", "all": [...]} atau {"any": [...]}
+# BodyTemp di maternal.csv tercatat dalam °F, jadi 37.5 °C = 99.5 °F
+ALERT_RULES = [
+    {"name":"high_bs", "label":"Blood Sugar tinggi", "column":"BS", "op":">", "value":8},
+    {"name":"high_sys", "label":"Tekanan darah sistolik tinggi", "column":"SystolicBP", "op":">", "value":130},
+    {"name":"high_dia", "label":"Tekanan darah diastolik tinggi", "column":"DiastolicBP", "op":">", "value":85},
+    {"name":"high_temp", "label":"Suhu tubuh tinggi", "column":"BodyTemp", "op":">", "value":99.5},
+    {"name":"hypertension", "label":"Hipertensi (sistolik & diastolik tinggi)", "all":["high_sys","high_dia"]},
+    {"name":"bp_and_bs", "label":"Tekanan darah & Blood Sugar tinggi", "all":["high_bs"], "any":["high_sys","high_dia"]},
+]
+
+
+def compile_rules(rules):
+    """Validate rules and resolve them into an evaluation plan.
+
+    Combination rules may only reference rules defined before them, so the
+    plan can be evaluated top to bottom in a single pass.
+    """
+    if len(rules) > MAX_RULES:
+        raise ValueError(f"At most {MAX_RULES} rules are supported, got {len(rules)}")
+
+    plan = []
+    index = {}
+
+    for rule in rules:
+        name = rule["name"]
+        if name in index:
+            raise ValueError(f"Duplicate rule name: {name}")
+
+        if "column" in rule:
+            for key in ["op", "value"]:
+                if key not in rule:
+                    raise ValueError(f"Rule {name} needs {key!r}")
+            if rule["op"] not in OPS:
+                raise ValueError(f"Unknown operator {rule['op']!r} in rule {name}")
+            step = ("threshold", rule["column"], OPS[rule["op"]], rule["value"])
+        else:
+            refs_all = rule.get("all", [])
+            refs_any = rule.get("any", [])
+            if not refs_all and not refs_any:
+                raise ValueError(f"Rule {name} needs a column or all/any references")
+            for ref in refs_all + refs_any:
+                if ref not in index:
+                    raise ValueError(f"Rule {name} references unknown rule {ref}")
+            step = (
+                "combine",
+                [index[r] for r in refs_all],
+                [index[r] for r in refs_any],
+            )
+
+        index[name] = len(plan)
+        plan.append(step)
+
+    names = [r["name"] for r in rules]
+    labels = [r.get("label", r["name"]) for r in rules]
+    return {"names": names, "labels": labels, "plan": plan}
+
+
+def evaluate(compiled, data):
+    """Evaluate every rule over columnar data in one pass.
+
+    ``data`` is a DataFrame or a mapping of column name -> array. Returns a
+    boolean matrix of shape (n_rows, n_rules).
+    """
+    plan = compiled["plan"]
+    columns = {}
+    n = None
+
+    for step in plan:
+        if step[0] == "threshold" and step[1] not in columns:
+            columns[step[1]] = np.asarray(data[step[1]])
+            n = len(columns[step[1]])
+
+    if n is None:
+        n = len(next(iter(data.values()))) if isinstance(data, dict) else len(data)
+
+    flags = np.zeros((n, len(plan)), dtype=bool)
+
+    for j, step in enumerate(plan):
+        if step[0] == "threshold":
+            _, col, op, value = step
+            op(columns[col], value, out=flags[:, j])
+        else:
+            _, refs_all, refs_any = step
+            mask = np.ones(n, dtype=bool)
+            if refs_all:
+                mask &= flags[:, refs_all].all(axis=1)
+            if refs_any:
+                mask &= flags[:, refs_any].any(axis=1)
+            flags[:, j] = mask
+
+    return flags
+
+
+class AlertEngine:
+    """Keeps the flag matrix for a growing dataset.
+
+    ``update`` only evaluates rows appended since the previous call. Flags
+    are kept as one block per batch and only concatenated when ``flags``
+    is read, so appending does not copy the history.
+    """
+
+    def __init__(self, rules=ALERT_RULES):
+        self.compiled = compile_rules(rules)
+        self._blocks = [np.zeros((0, len(self.compiled["names"])), dtype=bool)]
+        self.n_seen = 0
+
+    @property
+    def flags(self):
+        if len(self._blocks) > 1:
+            self._blocks = [np.concatenate(self._blocks)]
+        return self._blocks[0]
+
+    def append(self, new_rows):
+        """Evaluate a batch of new rows and return only their flags."""
+        new_flags = evaluate(self.compiled, new_rows)
+        if len(new_flags):
+            self._blocks.append(new_flags)
+            self.n_seen += len(new_flags)
+        return new_flags
+
+    def update(self, df):
+        if len(df) < self.n_seen:
+            raise ValueError("Data shrank since last update; create a new AlertEngine")
+        new_rows = df.iloc[self.n_seen:]
+        if len(new_rows):
+            self.append(new_rows)
+        return self.flags
+
+    def flagged(self, df):
+        """Return rows of ``df`` with at least one alert, plus their labels."""
+        flags = self.update(df)
+        return flagged_patients(df, flags, self.compiled)
+
+
+def alert_codes(flags):
+    """Encode each row of a flag matrix as a bitmask (bit j = rule j)."""
+    bits = np.left_shift(np.uint64(1), np.arange(flags.shape[1], dtype=np.uint64))
+    return (flags.astype(np.uint64) * bits).sum(axis=1, dtype=np.uint64)
+
+
+def code_labels(codes, compiled):
+    """Comma-joined rule labels for every code, joined once per distinct code."""
+    labels = compiled["labels"]
+    unique, inverse = np.unique(np.asarray(codes, dtype=np.uint64), return_inverse=True)
+    joined = np.array(
+        [", ".join(l for j, l in enumerate(labels) if (int(code) >> j) & 1) for code in unique],
+        dtype=object,
+    )
+    return joined[inverse.reshape(-1)]
+
+
+def flagged_patients(df, flags, compiled):
+    hit = flags.any(axis=1)
+
+    out = df[hit].copy()
+    out.insert(0, "Alerts", code_labels(alert_codes(flags[hit]), compiled))
+    out.insert(1, "AlertCount", flags[hit].sum(axis=1))
+    return out
+
+
+def population_alerts(compiled, df):
+    """Labels of threshold rules that the column means of ``df`` trigger."""
+    plan = compiled["plan"]
+    thresholds = [j for j, step in enumerate(plan) if step[0] == "threshold"]
+    means = {plan[j][1]: np.array([df[plan[j][1]].mean()]) for j in thresholds}
+    hit = evaluate(compiled, means)[0]
+    return [compiled["labels"][j] for j in thresholds if hit[j]]
+
+
+def alert_summary(flags, compiled):
+    return pd.DataFrame({
+        "Rule": compiled["labels"],
+        "Patients": flags.sum(axis=0),
+        "Pct": flags.mean(axis=0) * 100 if len(flags) else 0.0,
+    }).sort_values("Patients", ascending=False)
@@ -0,0 +1,285 @@
+"""Headless rerun-latency harness for the dashboard.
+
+Drives main.py through scripted interactions with Streamlit's AppTest,
+records wall time and rendered payload size per interaction, and compares
+them against a stored baseline.
+
+    python bench_app.py --update-baseline        # simpan baseline
+    python bench_app.py                          # bandingkan dengan baseline
+    python bench_app.py --rows 100000 --rows 1000000
+    python bench_app.py --compare-warmup         # time-to-first-render dengan/tanpa warm-up
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MODEL_FILE = "dt_joblib"
+BASELINE_FILE = os.path.join(ROOT, "bench_baseline.json")
+
+
+# ================= DATASETS =================
+def synthetic_dataset(n, seed=0):
+    """Resample maternal.csv to ``n`` rows with small jitter on the vitals."""
+    base = pd.read_csv(os.path.join(ROOT, "maternal.csv"))
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+
+    for col in ["Age","SystolicBP","DiastolicBP","HeartRate"]:
+        df[col] = (df[col] + rng.integers(-2, 3, n)).clip(base[col].min(), base[col].max())
+    df["BS"] = (df["BS"] + rng.normal(0, 0.2, n)).clip(base["BS"].min(), base["BS"].max()).round(1)
+    return df
+
+
+def prepare_workdir(rows):
+    """Directory containing the app and a dataset with ``rows`` rows (None = bundled)."""
+    workdir = tempfile.mkdtemp(prefix="bench_app_")
+    # semua modul ikut, jadi modul baru tidak perlu didaftarkan di sini
+    for path in glob.glob(os.path.join(ROOT, "*.py")) + [os.path.join(ROOT, MODEL_FILE)]:
+        os.symlink(path, os.path.join(workdir, os.path.basename(path)))
+
+    if rows is None:
+        os.symlink(os.path.join(ROOT, "maternal.csv"), os.path.join(workdir, "maternal.csv"))
+    else:
+        synthetic_dataset(rows).to_csv(os.path.join(workdir, "maternal.csv"), index=False)
+    return workdir
+
+
+# ================= INTERACTIONS =================
+def slider(at, label):
+    return next(s for s in at.slider if s.label == label)
+
+
+def payload_bytes(node):
+    """Serialized size of every element rendered under ``node``."""
+    total = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and not hasattr(node, "children"):
+        total += proto.ByteSize()
+    for child in getattr(node, "children", {}).values():
+        total += payload_bytes(child)
+    return total
+
+
+def interactions():
+    """(name, action) pairs run in order on one session, after an untimed first render.
+
+    The first render of a fresh process is already measured as
+    ``startup_cold``; it is not repeated here.
+    """
+    def narrow_age(at):
+        lo, hi = slider(at, "Mother Age").min, slider(at, "Mother Age").max
+        slider(at, "Mother Age").set_value((lo, lo + (hi - lo) // 2))
+
+    def narrow_bp(at):
+        s = slider(at, "Systolic BP")
+        s.set_value((s.min, s.min + (s.max - s.min) // 2))
+
+    def empty_result(at):
+        age = slider(at, "Mother Age")
+        sys_bp = slider(at, "Systolic BP")
+        age.set_value((age.max, age.max))
+        sys_bp.set_value((sys_bp.min, sys_bp.min))
+
+    def reset_filters(at):
+        for s in at.slider:
+            s.set_value((s.min, s.max))
+
+    def predict(at):
+        next(b for b in at.button if b.label == "Predict").click()
+
+    return [
+        ("slider_age", narrow_age),
+        ("slider_systolic", narrow_bp),
+        ("empty_filter", empty_result),
+        ("reset_filters", reset_filters),
+        ("predict_submit", predict),
+    ]
+
+
+def run_session(workdir, timeout):
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        at = AppTest.from_file(os.path.join(workdir, "main.py"), default_timeout=timeout)
+        at.run()
+        for name, action in interactions():
+            action(at)
+            start = time.perf_counter()
+            at.run()
+            elapsed = time.perf_counter() - start
+
+            if at.exception:
+                raise RuntimeError(f"{name}: app raised {at.exception[0].value}")
+            results[name] = {"time": elapsed, "bytes": payload_bytes(at._tree)}
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+# ================= STARTUP =================
+def first_render(workdir, timeout):
+    """Cold and warm time-to-first-render, measured inside a fresh process.
+
+    ``cold`` is the first visitor after process start (model unpickle, data
+    load and every section build included); ``warm`` is a new session once
+    the first one has finished.
+    """
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for name in ["startup_cold", "startup_warm"]:
+            at = AppTest.from_file(os.path.join(workdir, "main.py"), default_timeout=timeout)
+            start = time.perf_counter()
+            at.run()
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"{name}: app raised {at.exception[0].value}")
+            results[name] = {"time": elapsed, "bytes": payload_bytes(at._tree)}
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+# ================= ISOLATION =================
+# st.cache_data/st.cache_resource hidup selama proses; tiap sesi diukur di
+# proses baru agar sesi berikutnya tidak membaca cache sesi sebelumnya
+CHILD_MODES = {"session": run_session, "startup": first_render}
+
+
+def run_child(mode, workdir, timeout, warmup=False):
+    env = dict(os.environ, MATERNAL_WARMUP="1" if warmup else "0")
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, workdir, "--timeout", str(timeout)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(rows, repeat, timeout, compare_warmup=False):
+    workdir = prepare_workdir(rows)
+    try:
+        startup = [run_child("startup", workdir, timeout) for _ in range(repeat)]
+        if compare_warmup:
+            with_warmup = [run_child("startup", workdir, timeout, warmup=True) for _ in range(repeat)]
+            for name in ["startup_cold", "startup_warm"]:
+                on = statistics.median(r[name]["time"] for r in with_warmup)
+                off = statistics.median(r[name]["time"] for r in startup)
+                print(f"  {name:<16} warm-up on {on*1000:9.1f} ms | off {off*1000:9.1f} ms")
+        runs = [run_child("session", workdir, timeout) for _ in range(repeat)]
+    finally:
+        shutil.rmtree(workdir)
+
+    runs = [{**s, **r} for s, r in zip(startup, runs)]
+
+    # median waktu per interaksi + rentang antar run (noise band untuk compare);
+    # ukuran payload harus sama tiap run
+    out = {}
+    for name in runs[0]:
+        times = [r[name]["time"] for r in runs]
+        out[name] = {
+            "time": statistics.median(times),
+            "spread": max(times) - min(times),
+            "bytes": runs[-1][name]["bytes"],
+        }
+    return out
+
+
+# ================= BASELINE =================
+def compare(current, baseline, time_tol, bytes_tol, min_time):
+    failures = []
+    for dataset, interactions_ in current.items():
+        for name, now in interactions_.items():
+            ref = baseline.get(dataset, {}).get(name)
+            if ref is None:
+                print(f"  {dataset:>10} {name:<16} {now['time']*1000:9.1f} ms {now['bytes']:>10} B  (no baseline)")
+                failures.append((dataset, name, "NO BASELINE"))
+                continue
+
+            # toleransi: relatif, absolut, atau 2x noise yang terukur saat baseline dibuat
+            band = max(ref["time"] * time_tol, min_time, 2 * ref.get("spread", 0.0))
+            slow = now["time"] > ref["time"] + band
+            big = now["bytes"] > ref["bytes"] * (1 + bytes_tol)
+            flag = " SLOWER" * slow + " LARGER" * big
+            print(
+                f"  {dataset:>10} {name:<16} {now['time']*1000:9.1f} ms (base {ref['time']*1000:9.1f})"
+                f" {now['bytes']:>10} B (base {ref['bytes']:>10}){flag}"
+            )
+            if flag:
+                failures.append((dataset, name, flag.strip()))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, action="append", default=[],
+                        help="also run against a synthetic dataset of this many rows (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="sessions per dataset; median time is kept")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--bytes-tolerance", type=float, default=0.05, help="allowed relative payload growth")
+    parser.add_argument("--min-time", type=float, default=0.15,
+                        help="absolute slowdown (s) always tolerated, to ignore noise on fast reruns")
+    parser.add_argument("--compare-warmup", action="store_true",
+                        help="also print time-to-first-render with the startup warm-up enabled")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "WORKDIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter("ignore")
+
+    if args.child:
+        mode, workdir = args.child
+        print(json.dumps(CHILD_MODES[mode](workdir, args.timeout)))
+        return 0
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 2
+
+    current = {"bundled": measure(None, args.repeat, args.timeout, args.compare_warmup)}
+    for rows in args.rows:
+        current[f"rows={rows}"] = measure(rows, args.repeat, args.timeout, args.compare_warmup)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(current)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=1)
+        compare(current, {}, 0, 0, 0)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    failures = compare(current, baseline, args.time_tolerance, args.bytes_tolerance, args.min_time)
+    if failures:
+        print(f"{len(failures)} regression(s):")
+        for dataset, name, flag in failures:
+            print(f"  {dataset} / {name}: {flag}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
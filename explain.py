@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# ================= MODEL INPUT =================
+MODEL_FEATURES = ["Age","SystolicBP","DiastolicBP","BS","HeartRate","BodyTemp_C"]
+
+LABEL_MAP = {1:"Low Risk", 2:"Mid Risk", 3:"High Risk"}
+
+
+def to_model_frame(df):
+    """Convert dataset rows (BodyTemp in °F) into the model's input columns."""
+    if "BodyTemp_C" in df.columns:
+        return df[MODEL_FEATURES]
+    X = df[MODEL_FEATURES[:-1]].copy()
+    X["BodyTemp_C"] = (df["BodyTemp"] - 32) * 5 / 9
+    return X
+
+
+# ================= DECISION PATHS =================
+def decision_paths(model, X):
+    """Root-to-leaf path of every sample, computed from the sparse decision path.
+
+    Returns a long DataFrame with one row per split visited:
+    sample, node, feature, threshold, value, direction ("<=" or ">").
+    Rows of each sample are ordered from root to leaf. ``direction`` is the
+    branch the tree actually took, not a re-comparison of ``value``.
+    """
+    tree = model.tree_
+    names = np.asarray(model.feature_names_in_, dtype=object)
+    values = np.asarray(X, dtype=np.float64)
+
+    indicator = model.decision_path(X).tocsr()
+    indicator.sort_indices()
+
+    # node ids grow from parent to child, so sorted CSR indices are root -> leaf
+    nodes = indicator.indices
+    samples = np.repeat(np.arange(indicator.shape[0]), np.diff(indicator.indptr))
+
+    # arah diambil dari node berikutnya di path (split tidak pernah node terakhir)
+    next_nodes = np.roll(nodes, -1)
+
+    split = tree.feature[nodes] >= 0
+    nodes = nodes[split]
+    samples = samples[split]
+    went_left = tree.children_left[nodes] == next_nodes[split]
+    feature = tree.feature[nodes]
+    threshold = tree.threshold[nodes]
+    value = values[samples, feature]
+
+    return pd.DataFrame({
+        "sample": samples,
+        "node": nodes,
+        "feature": names[feature],
+        "threshold": threshold,
+        "value": value,
+        "direction": np.where(went_left, "<=", ">"),
+    })
+
+
+def leaf_paths(model):
+    """Readable rule for every leaf, keyed by leaf node id.
+
+    A leaf uniquely identifies its root-to-leaf path, so batches can be
+    explained with ``model.apply`` and a lookup into this table.
+    """
+    tree = model.tree_
+    names = model.feature_names_in_
+    parent = np.full(tree.node_count, -1)
+    went_left = np.zeros(tree.node_count, dtype=bool)
+
+    left = tree.children_left
+    right = tree.children_right
+    internal = left >= 0
+    parent[left[internal]] = np.flatnonzero(internal)
+    parent[right[internal]] = np.flatnonzero(internal)
+    went_left[left[internal]] = True
+
+    paths = {}
+    for leaf in np.flatnonzero(~internal):
+        steps = []
+        node = leaf
+        while parent[node] >= 0:
+            p = parent[node]
+            op = "<=" if went_left[node] else ">"
+            steps.append(f"{names[tree.feature[p]]} {op} {tree.threshold[p]:.2f}")
+            node = p
+        paths[int(leaf)] = " AND ".join(reversed(steps))
+    return paths
+
+
+def explain_batch(model, X, paths=None, label_map=LABEL_MAP):
+    """Prediction, leaf id and readable path for every row of ``X``."""
+    if paths is None:
+        paths = leaf_paths(model)
+    leaves = model.apply(X)
+    prediction = model.classes_[model.tree_.value[leaves, 0].argmax(axis=1)]
+
+    leaf_ids = np.fromiter(paths.keys(), dtype=np.int64)
+    lookup = np.empty(model.tree_.node_count, dtype=object)
+    lookup[leaf_ids] = list(paths.values())
+
+    return pd.DataFrame({
+        "Prediction": pd.Series(prediction).map(label_map).to_numpy(),
+        "Leaf": leaves,
+        "Path": lookup[leaves],
+    }, index=getattr(X, "index", None))
+
+
+def top_paths(model, X, k=5, paths=None, label_map=LABEL_MAP):
+    """Most common decision paths per predicted risk class."""
+    if paths is None:
+        paths = leaf_paths(model)
+    leaves = model.apply(X)
+    counts = np.bincount(leaves, minlength=model.tree_.node_count)
+    used = np.flatnonzero(counts)
+
+    prediction = model.classes_[model.tree_.value[used, 0].argmax(axis=1)]
+    out = pd.DataFrame({
+        "Prediction": pd.Series(prediction).map(label_map).to_numpy(),
+        "Leaf": used,
+        "Patients": counts[used],
+        "Path": [paths[int(leaf)] for leaf in used],
+    })
+    out["Pct"] = out["Patients"] / len(leaves) * 100
+
+    return (
+        out.sort_values(["Prediction","Patients"], ascending=[True,False])
+        .groupby("Prediction", sort=False)
+        .head(k)
+        .reset_index(drop=True)
+    )
@@ -1,18 +1,22 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import joblib
+from alerts import code_labels, population_alerts
+from explain import decision_paths
+import partitions as parts
+from visits import VisitStore
+import registry
+import sections
+from sections import RISK_MAP, RISK_BOX_COLS
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import time
 
 # ================= PAGE =================
 st.set_page_config(page_title="Maternal Health Dashboard", layout="wide")
 
 # ================= RISK ENCODING =================
-RISK_MAP = {
-    "low risk":1,
-    "mid risk":2,
-    "high risk":3
-}
-
 INV_RISK_MAP = {v:k for k,v in RISK_MAP.items()}
 
 st.markdown("""
@@ -49,13 +53,6 @@ sdg_data = {
 
 sdg_df = pd.DataFrame(sdg_data)
 
-# ================= COLOR MAP =================
-COLOR_MAP = {
-    "low risk":"#2ecc71",
-    "mid risk":"#f39c12",
-    "high risk":"#e74c3c"
-}
-
 st.markdown("""
 <div style="
 background:rgba(255,255,255,0.03);
@@ -126,8 +123,131 @@ menghindari tingginya resiko kehamilan.
 st.divider()
     
 # ================= LOAD DATA =================
-df = pd.read_csv("maternal.csv")
-model = joblib.load("dt_joblib")
+# dataset per klinik (data/site=.../) jika ada, selain itu maternal.csv
+DATA_DIR = "data"
+
+@st.cache_data
+def load_metadata(root, mtime):
+    if root == ".":
+        return parts.csv_metadata("maternal.csv")
+    return parts.load_metadata(root)
+
+@st.cache_data
+def read_partition(root, path, mtime):
+    return parts.read_partition(root, path)
+
+def cached_reader(root, path):
+    return read_partition(root, path, os.path.getmtime(os.path.join(root, path)))
+
+if parts.has_partitions(DATA_DIR):
+    data_root = DATA_DIR
+    meta_path = os.path.join(DATA_DIR, parts.METADATA_FILE)
+else:
+    data_root = "."
+    meta_path = "maternal.csv"
+
+meta_mtime = os.path.getmtime(meta_path)
+partition_meta = load_metadata(data_root, meta_mtime)
+
+def filter_bounds(site_parts):
+    """Full slider ranges for the selected partitions, typed like the sliders."""
+    age = parts.bounds(site_parts, "Age")
+    bs = parts.bounds(site_parts, "BS")
+    sys_bp = parts.bounds(site_parts, "SystolicBP")
+    dia = parts.bounds(site_parts, "DiastolicBP")
+    return {
+        "Age": (int(age[0]), int(age[1])),
+        "BS": (float(bs[0]), float(bs[1])),
+        "SystolicBP": (int(sys_bp[0]), int(sys_bp[1])),
+        "DiastolicBP": (int(dia[0]), int(dia[1])),
+    }
+
+def load_state(site_parts, filter_ranges):
+    """KPI summary and filtered rows; rows is None when nothing matches."""
+    # partisi yang sepenuhnya di dalam filter tidak perlu difilter per baris
+    full_parts, partial_parts = parts.prune(site_parts, filter_ranges)
+    partial_df = parts.load_filtered(data_root, [], partial_parts, filter_ranges, reader=cached_reader)
+    summary = parts.kpis(full_parts, partial_df)
+
+    if summary["rows"] == 0:
+        return summary, None
+
+    full_df = parts.load_filtered(data_root, full_parts, [], filter_ranges, reader=cached_reader)
+    return summary, pd.concat([f for f in (full_df, partial_df) if len(f)], ignore_index=True)
+
+def state_key(selected_parts, filter_ranges):
+    paths = tuple(p["path"] for p in selected_parts)
+    return (data_root, meta_mtime, paths, tuple(sorted(filter_ranges.items())))
+
+# figure menyimpan baris hasil filter (~400 KB/render), jadi cache dibatasi
+# pada beberapa state filter terakhir
+SECTION_CACHE_STATES = 4
+
+@st.cache_data(show_spinner=False, max_entries=len(sections.SECTIONS) * SECTION_CACHE_STATES, ttl=3600)
+def build_section(name, key, _df):
+    return sections.SECTIONS[name](_df)
+
+@st.cache_data(show_spinner=False, max_entries=len(sections.MODEL_SECTIONS) * SECTION_CACHE_STATES, ttl=3600)
+def build_model_section(name, key, version, _df, _served):
+    return sections.MODEL_SECTIONS[name](_df, _served)
+
+# ================= WARM-UP =================
+# opsional (MATERNAL_WARMUP=1): state default dihitung di satu thread background.
+# Streamlit baru menjalankan script saat pengunjung pertama datang, dan builder
+# section terikat GIL, jadi di mesin 1 CPU warm-up tidak mempercepat cold start;
+# default-nya mati. Ukur dengan `python bench_app.py --compare-warmup`.
+WARMUP = os.environ.get("MATERNAL_WARMUP", "0") == "1"
+
+log = logging.getLogger("maternal.warmup")
+
+def report_warmup(future):
+    if future.exception() is not None:
+        log.error("Warm-up failed: %r", future.exception())
+    else:
+        log.info("Warm-up finished in %.2f s", future.result())
+
+@st.cache_resource(show_spinner=False)
+def start_warmup(data_root, meta_mtime, _partition_meta):
+    def run():
+        start = time.perf_counter()
+        ranges = filter_bounds(_partition_meta)
+        _, df = load_state(_partition_meta, ranges)
+        key = state_key(_partition_meta, ranges)
+
+        served = get_model_server().active
+        for name in sections.MODEL_SECTIONS:
+            build_model_section(name, key, served.version, df, served)
+        for name in sections.SECTIONS:
+            build_section(name, key, df)
+        return time.perf_counter() - start
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warmup")
+    future = pool.submit(run)
+    future.add_done_callback(report_warmup)
+    pool.shutdown(wait=False)
+    return future
+
+# ================= MODEL =================
+# model yang dipromosikan di models/ (fallback: dt_joblib), di-reload otomatis
+MODELS_DIR = "models"
+
+@st.cache_resource(show_spinner=False)
+def get_model_server():
+    return registry.ModelServer(MODELS_DIR)
+
+if WARMUP:
+    warmup = start_warmup(data_root, meta_mtime, partition_meta)
+    if warmup.done() and warmup.exception() is not None:
+        st.sidebar.warning(f"Warm-up gagal: {warmup.exception()!r}")
+
+# satu snapshot per rerun; swap versi baru tidak mengganggu rerun yang sedang jalan
+model_server = get_model_server()
+served = model_server.active
+model = served.model
+
+st.sidebar.caption(f"🤖 Model: {served.version}")
+if model_server.error:
+    st.sidebar.warning(f"Model gagal dimuat, tetap memakai {served.version}: {model_server.error}")
 
 DEBUG = False
 
@@ -137,49 +257,88 @@ if DEBUG:
 # ================= SIDEBAR FILTER =================
 st.sidebar.markdown("## 🔎 Filter Data")
 
+# SITE
+all_sites = sorted({p["site"] for p in partition_meta})
+if len(all_sites) > 1:
+    selected_sites = st.sidebar.multiselect("Site", all_sites, default=all_sites)
+else:
+    selected_sites = all_sites
+
+site_parts = parts.select_sites(partition_meta, selected_sites)
+
+# MONTH (hanya untuk dataset yang dipartisi per bulan)
+all_months = parts.months(site_parts)
+if len(all_months) > 1:
+    month_range = st.sidebar.select_slider(
+        "Month",
+        options=all_months,
+        value=(all_months[0], all_months[-1])
+    )
+    site_parts = parts.select_months(site_parts, *month_range)
+
+if not site_parts:
+    st.warning("No data matches selected filters")
+    st.stop()
+
+# slider bounds dari metadata partisi
+slider_bounds = filter_bounds(site_parts)
+age_min, age_max = slider_bounds["Age"]
+bs_min, bs_max = slider_bounds["BS"]
+sys_min, sys_max = slider_bounds["SystolicBP"]
+dia_min, dia_max = slider_bounds["DiastolicBP"]
+
 # AGE
 age_range = st.sidebar.slider(
     "Mother Age",
-    int(df.Age.min()),
-    int(df.Age.max()),
-    (int(df.Age.min()), int(df.Age.max()))
+    int(age_min),
+    int(age_max),
+    (int(age_min), int(age_max))
 )
 
 # BLOOD SUGAR
 bs_range = st.sidebar.slider(
     "Blood Sugar",
-    float(df.BS.min()),
-    float(df.BS.max()),
-    (float(df.BS.min()), float(df.BS.max()))
+    float(bs_min),
+    float(bs_max),
+    (float(bs_min), float(bs_max))
 )
 
 # SYSTOLIC
 sys_range = st.sidebar.slider(
     "Systolic BP",
-    int(df.SystolicBP.min()),
-    int(df.SystolicBP.max()),
-    (int(df.SystolicBP.min()), int(df.SystolicBP.max()))
+    int(sys_min),
+    int(sys_max),
+    (int(sys_min), int(sys_max))
 )
 
 # DIASTOLIC
 dia_range = st.sidebar.slider(
     "Diastolic BP",
-    int(df.DiastolicBP.min()),
-    int(df.DiastolicBP.max()),
-    (int(df.DiastolicBP.min()), int(df.DiastolicBP.max()))
+    int(dia_min),
+    int(dia_max),
+    (int(dia_min), int(dia_max))
 )
 
-filtered_df = df[
-    df.Age.between(age_range[0], age_range[1]) &
-    df.BS.between(bs_range[0], bs_range[1]) &
-    df.SystolicBP.between(sys_range[0], sys_range[1]) &
-    df.DiastolicBP.between(dia_range[0], dia_range[1])
-]
+filter_ranges = {
+    "Age": age_range,
+    "BS": bs_range,
+    "SystolicBP": sys_range,
+    "DiastolicBP": dia_range,
+}
+
+summary, filtered_df = load_state(site_parts, filter_ranges)
 
-if filtered_df.empty:
+if filtered_df is None:
     st.warning("No data matches selected filters")
     st.stop()
 
+filter_key = state_key(site_parts, filter_ranges)
+
+def section(name):
+    if name in sections.MODEL_SECTIONS:
+        return build_model_section(name, filter_key, served.version, filtered_df, served)
+    return build_section(name, filter_key, filtered_df)
+
 # CONTACT ME
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 👩‍💻 Contact Me")
@@ -280,20 +439,20 @@ with center:
     # ===== ROW 1 =====
     c1, c2, c3, c4, c5, c6, c7 = st.columns(7)
 
-    c1.markdown(card("Total Patients", len(filtered_df)), unsafe_allow_html=True)
-    c2.markdown(card("Average Age", round(filtered_df.Age.mean(),1)), unsafe_allow_html=True)
-    c3.markdown(card("Average Glucose", round(filtered_df.BS.mean(),1)), unsafe_allow_html=True)
-    c4.markdown(card("Avg Systolic BP", round(filtered_df.SystolicBP.mean(),1)), unsafe_allow_html=True)
-    c5.markdown(card("Avg Diastolic BP", round(filtered_df.DiastolicBP.mean(),1)), unsafe_allow_html=True)
-    c6.markdown(card("Avg Heart Rate", round(filtered_df.HeartRate.mean(),1)), unsafe_allow_html=True)
-    c7.markdown(card("Avg Body Temp", round(filtered_df.BodyTemp.mean(),1)), unsafe_allow_html=True)
+    c1.markdown(card("Total Patients", summary["rows"]), unsafe_allow_html=True)
+    c2.markdown(card("Average Age", round(summary["mean"]["Age"],1)), unsafe_allow_html=True)
+    c3.markdown(card("Average Glucose", round(summary["mean"]["BS"],1)), unsafe_allow_html=True)
+    c4.markdown(card("Avg Systolic BP", round(summary["mean"]["SystolicBP"],1)), unsafe_allow_html=True)
+    c5.markdown(card("Avg Diastolic BP", round(summary["mean"]["DiastolicBP"],1)), unsafe_allow_html=True)
+    c6.markdown(card("Avg Heart Rate", round(summary["mean"]["HeartRate"],1)), unsafe_allow_html=True)
+    c7.markdown(card("Avg Body Temp", round(summary["mean"]["BodyTemp"],1)), unsafe_allow_html=True)
 
     # ===== ROW 2 =====
     k8, k9, k10, k11, k12, k13, k14  = st.columns(7)
     
-    high_risk_pct = (filtered_df.RiskLevel == "high risk").mean()*100
-    mid_pct = (filtered_df.RiskLevel == "mid risk").mean()*100
-    low_pct = (filtered_df.RiskLevel == "low risk").mean()*100
+    high_risk_pct = summary["risk"]["high risk"]/summary["rows"]*100
+    mid_pct = summary["risk"]["mid risk"]/summary["rows"]*100
+    low_pct = summary["risk"]["low risk"]/summary["rows"]*100
     
     k8.markdown(risk_card("High Risk", f"{high_risk_pct:.1f}%", "#e74c3c"), unsafe_allow_html=True)
     k9.markdown(risk_card("Mid Risk", f"{mid_pct:.1f}%", "#f39c12"), unsafe_allow_html=True)
@@ -319,94 +478,17 @@ c1, c2, c3, c4, c5 = st.columns(5)
 # ---------- PIE ----------
 with c1:
     st.caption("Risk Distribution")
-
-    fig = px.pie(
-        filtered_df,
-        names="RiskLevel",
-        color="RiskLevel",
-        color_discrete_map=COLOR_MAP
-    )
-
-    fig.update_layout(
-        font_color="white",
-        margin=dict(l=0,r=0,t=20,b=0),
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=-0.15,
-            xanchor="center",
-            x=0.5
-        )
-    )
-
-    fig.update_traces(textfont_color="white")
-    st.plotly_chart(fig, use_container_width=True)
-
-# ---------- AGE ----------
-with c2:
-    st.caption("Age Distribution")
-
-    fig_age = px.box(
-        filtered_df,
-        x="RiskLevel",
-        y="Age",
-        color="RiskLevel",
-        color_discrete_map=COLOR_MAP,
-        category_orders={"RiskLevel":["low risk","mid risk","high risk"]}
-    )
-
-    fig_age.update_layout(font_color="white", margin=dict(l=0,r=0,t=20,b=0))
-    st.plotly_chart(fig_age, use_container_width=True)
-
-# ---------- BS ----------
-with c3:
-    st.caption("Blood Sugar")
-
-    fig_bs = px.box(
-        filtered_df,
-        x="RiskLevel",
-        y="BS",
-        color="RiskLevel",
-        color_discrete_map=COLOR_MAP,
-        category_orders={"RiskLevel":["low risk","mid risk","high risk"]}
-    )
-
-    fig_bs.update_layout(font_color="white", margin=dict(l=0,r=0,t=20,b=0))
-    st.plotly_chart(fig_bs, use_container_width=True)
-
-# ---------- SYSTOLIC ----------
-with c4:
-    st.caption("Systolic BP")
-
-    fig_sys = px.box(
-        filtered_df,
-        x="RiskLevel",
-        y="SystolicBP",
-        color="RiskLevel",
-        color_discrete_map=COLOR_MAP,
-        category_orders={"RiskLevel":["low risk","mid risk","high risk"]}
-    )
-
-    fig_sys.update_layout(font_color="white", margin=dict(l=0,r=0,t=20,b=0))
-    st.plotly_chart(fig_sys, use_container_width=True)
-
-# ---------- DIASTOLIC ----------
-with c5:
-    st.caption("Diastolic BP")
-
-    fig_dia = px.box(
-        filtered_df,
-        x="RiskLevel",
-        y="DiastolicBP",
-        color="RiskLevel",
-        color_discrete_map=COLOR_MAP,
-        category_orders={"RiskLevel":["low risk","mid risk","high risk"]}
-    )
-
-    fig_dia.update_layout(font_color="white", margin=dict(l=0,r=0,t=20,b=0))
-    st.plotly_chart(fig_dia, use_container_width=True)
+    st.plotly_chart(section("pie"), use_container_width=True)
+
+# ---------- RISK BOXES ----------
+for col, caption, container in zip(
+    RISK_BOX_COLS,
+    ["Age Distribution","Blood Sugar","Systolic BP","Diastolic BP"],
+    [c2,c3,c4,c5]
+):
+    with container:
+        st.caption(caption)
+        st.plotly_chart(section(f"risk_box_{col}"), use_container_width=True)
 st.divider()
 
 # ================= INSIGHT ANALYSIS =================
@@ -474,27 +556,9 @@ c1, c2, c3, c4, c5, c6 = st.columns(6)
 
 for col, container in zip(cols, [c1,c2,c3,c4,c5,c6]):
     with container:
+        st.plotly_chart(section(f"outlier_box_{col}"), use_container_width=True)
 
-        fig = px.box(
-            filtered_df,
-            y=col,
-            points="outliers"
-        )
-
-        fig.update_layout(
-            title=col,
-            font_color="white",
-            margin=dict(l=0,r=0,t=30,b=0),
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            showlegend=False
-        )
-
-        fig.update_traces(
-            marker=dict(size=5)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+st.caption("Titik merah menandai outlier IQR berdasarkan batas seluruh dataset, sama dengan Outlier Insights di bawah.")
 st.divider()
 
 # ================= OUTLIER INSIGHT =================
@@ -502,23 +566,8 @@ st.markdown("### Outlier Insights")
 
 numeric_cols = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
 
-insights = []
-
-for col in numeric_cols:
-    Q1 = filtered_df[col].quantile(0.25)
-    Q3 = filtered_df[col].quantile(0.75)
-    IQR = Q3 - Q1
-    
-    lower = Q1 - 1.5 * IQR
-    upper = Q3 + 1.5 * IQR
-    
-    outliers = filtered_df[(filtered_df[col] < lower) | (filtered_df[col] > upper)]
-    pct = len(outliers) / len(filtered_df) * 100
-    
-    insights.append((col, pct))
-
-# sorting berdasarkan outlier terbesar
-insights.sort(key=lambda x: x[1], reverse=True)
+# flag IQR & Mahalanobis sudah dihitung saat data dimuat (lihat outliers.py)
+insights = section("outlier_insights")
 
 most = insights[0]
 least = insights[-1]
@@ -537,6 +586,16 @@ st.markdown(f"""
 - Variabel dengan outlier rendah menunjukkan distribusi stabil
 - Outlier bisa menunjukkan kondisi medis ekstrem yang penting dianalisis
 """)
+
+multi_df = filtered_df[filtered_df["MultiOutlier"]]
+
+st.markdown(f"""
+**Multivariate Outliers** (robust Mahalanobis per risk level)
+- **{len(multi_df)}** pasien ({len(multi_df) / len(filtered_df) * 100:.1f}%) memiliki kombinasi nilai yang tidak biasa untuk kelompok risikonya
+""")
+
+with st.expander("Show multivariate outliers"):
+    st.dataframe(multi_df.sort_values("MahalDist", ascending=False), use_container_width=True)
 st.divider()
 # ================= DATA DISTRIBUTION =================
 st.markdown(
@@ -549,25 +608,7 @@ grid = st.columns(3)
 
 for i,col in enumerate(cols):
     with grid[i%3]:
-
-        fig = px.histogram(filtered_df, x=col, nbins=20)
-
-        fig.update_traces(
-            marker=dict(
-                color="#5DADE2",
-                line=dict(color="white", width=1.2)
-            )
-        )
-
-        fig.update_layout(
-            title=col,
-            font_color="white",
-            margin=dict(l=0,r=0,t=30,b=0),
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)"
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(section(f"hist_{col}"), use_container_width=True)
 
 st.divider()
 # ================= DATA DISTRIBUTION INSIGHT =================
@@ -575,29 +616,7 @@ st.markdown("### Distribution Insights")
 
 cols_left, cols_right = st.columns(2)
 
-variables = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
-
-def get_skew_label(skew):
-    if skew > 0.5:
-        return "right-skewed (lebih banyak nilai rendah)"
-    elif skew < -0.5:
-        return "left-skewed (lebih banyak nilai tinggi)"
-    else:
-        return "relatively symmetric"
-
-texts = []
-
-for col in variables:
-    mean = filtered_df[col].mean()
-    median = filtered_df[col].median()
-    skew = filtered_df[col].skew()
-
-    texts.append(f"""
-**{col}**
-- Mean = {mean:.2f}  
-- Median = {median:.2f}  
-- Distribution shape = {get_skew_label(skew)}
-""")
+texts = section("distribution_texts")
 
 # bagi jadi 2 kolom (3 kiri, 3 kanan)
 with cols_left:
@@ -607,11 +626,6 @@ with cols_right:
     st.markdown("\n".join(texts[3:]))
 
 st.divider()
-# ================= OHE =================
-df_encoded = filtered_df.copy()
-
-df_encoded["RiskLevel"] = df_encoded["RiskLevel"].map(RISK_MAP)
-
 # ================= CORRELATION HEATMAP =================
 st.markdown("<h2 style='text-align:center;'>Heatmap Correlation</h2>", unsafe_allow_html=True)
 
@@ -620,32 +634,8 @@ left, right = st.columns([1.2,1])
 # ---------- HEATMAP ----------
 with left:
 
-    numeric_cols = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
-    corr = df_encoded[numeric_cols + ["RiskLevel"]].corr()
-
-    fig = px.imshow(
-        corr,
-        text_auto=".2f",
-        color_continuous_scale="RdBu_r",
-        aspect="auto",
-        height=600
-    )
-
-    fig.update_traces(
-        textfont=dict(
-            color="black",
-            size=14,
-            family="Arial Black"
-        )
-    )
-
-    fig.update_layout(
-        font_color="white",
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)"
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    corr = section("corr")
+    st.plotly_chart(section("heatmap"), use_container_width=True)
 
 # ---------- EXPLANATION ----------
 with right:
@@ -729,9 +719,12 @@ if predict_btn:
 
     prediction = model.predict(input_data)[0]
 
-    label_map = {1:"Low Risk", 2:"Mid Risk", 3:"High Risk"}
+    label_map = served.meta["label_map"]
     result = label_map[prediction]
 
+    registry.log_prediction(MODELS_DIR, served.version, input_data.iloc[0].to_dict(), int(prediction))
+    st.caption(f"Model version: {served.version}")
+
     if result == "High Risk":
         st.error(result)
         st.markdown("""
@@ -748,6 +741,25 @@ if predict_btn:
                     I am very happy knowing that you are in a very good condition. Eat well, stay active, and don't forget to visit your doctor regularly for check-ups!
                     """)
 
+    # ===== WHY THIS RESULT =====
+    st.markdown("#### Why this result?")
+    path = decision_paths(model, input_data)
+    st.dataframe(
+        path[["feature","value","direction","threshold"]].rename(columns={
+            "feature":"Variable", "value":"Input", "direction":"Rule", "threshold":"Threshold"
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+
+# ===== BATCH EXPLANATION =====
+with st.expander("Most common decision paths per risk level (filtered data)"):
+    st.dataframe(
+        section("common_paths"),
+        hide_index=True,
+        use_container_width=True
+    )
+
 st.divider()
 # ================= DATA SUMMARY =================
 st.markdown("""
@@ -779,11 +791,6 @@ st.markdown("""
 
 st.markdown("<hr style='margin-top:10px;margin-bottom:30px;border:1px solid rgba(255,255,255,0.05);'>", unsafe_allow_html=True)
 
-avg_bs = filtered_df["BS"].mean()
-avg_sys = filtered_df["SystolicBP"].mean()
-avg_dia = filtered_df["DiastolicBP"].mean()
-avg_temp = filtered_df["BodyTemp"].mean()
-
 # cari variabel paling berpengaruh dari korelasi
 corr_target = corr["RiskLevel"].drop("RiskLevel").abs().sort_values(ascending=False)
 top_feature = corr_target.index[0]
@@ -802,26 +809,29 @@ st.markdown(f"""
 # ================= HEALTH INTERPRETATION =================
 st.markdown("### 🩺 Health Interpretation")
 
-alerts = []
-
-if avg_bs > 8:
-    alerts.append("Average Blood Sugar tergolong tinggi")
-
-if avg_sys > 130:
-    alerts.append("Rata-rata tekanan darah sistolik tinggi")
-
-if avg_dia > 85:
-    alerts.append("Rata-rata tekanan darah diastolik tinggi")
-
-if avg_temp > 37.5:
-    alerts.append("Rata-rata suhu tubuh cenderung tinggi")
+# threshold & satuan diambil dari ALERT_RULES, diterapkan ke rata-rata populasi
+alerts = population_alerts(sections.COMPILED_RULES, filtered_df)
 
 if alerts:
     for a in alerts:
-        st.warning(a)
+        st.warning(f"Rata-rata populasi: {a}")
 else:
     st.success("Sebagian besar indikator populasi berada dalam rentang normal")
 
+# ================= PATIENT ALERTS =================
+st.markdown("### 🚨 Flagged Patients")
+
+alert_table, flagged_df = section("patient_alerts")
+
+a1, a2 = st.columns([1,2])
+
+with a1:
+    st.markdown(card("Flagged Patients", f"{len(flagged_df)} / {len(filtered_df)}"), unsafe_allow_html=True)
+    st.dataframe(alert_table, hide_index=True, use_container_width=True)
+
+with a2:
+    st.dataframe(flagged_df, use_container_width=True)
+
 # ================= RECOMMENDATION =================
 st.markdown("### 💡 Recommendation")
 
@@ -835,6 +845,73 @@ Berdasarkan pola data:
 """)
 
 st.divider()
+# ================= RISK TRAJECTORY =================
+# hanya tampil jika ada data kunjungan (python visits.py visits append ...)
+VISITS_DIR = "visits"
+
+@st.cache_data
+def load_latest(root, mtime):
+    return VisitStore(root).latest
+
+@st.cache_data
+def load_history(root, patient_id, mtime):
+    return VisitStore(root).history(patient_id)
+
+visit_store = VisitStore(VISITS_DIR)
+
+if os.path.exists(visit_store.latest_path):
+    st.subheader("📈 Risk Trajectory")
+
+    latest_mtime = os.path.getmtime(visit_store.latest_path)
+    latest_df = load_latest(VISITS_DIR, latest_mtime)
+    rose_df = latest_df[latest_df["PredictedRisk"] > latest_df["PrevRisk"]].copy()
+    if "AlertMask" in rose_df.columns:
+        rose_df.insert(0, "Alerts", code_labels(rose_df["AlertMask"], sections.COMPILED_RULES))
+
+    t1, t2, t3 = st.columns(3)
+    t1.markdown(card("Monitored Patients", len(latest_df)), unsafe_allow_html=True)
+    t2.markdown(risk_card("Risk Rose Since Last Visit", len(rose_df), "#e74c3c"), unsafe_allow_html=True)
+    t3.markdown(card("Latest Visit", latest_df["VisitDate"].max().date()), unsafe_allow_html=True)
+
+    left, right = st.columns([1,1.4])
+
+    with left:
+        st.caption("Patients whose predicted risk rose")
+        st.dataframe(
+            rose_df.sort_values("VisitDate", ascending=False)[[c for c in ["Alerts","VisitDate","PrevRisk","PredictedRisk"] if c in rose_df.columns] + numeric_cols],
+            use_container_width=True
+        )
+
+    with right:
+        patient_id = st.text_input(
+            "Patient ID",
+            value=str(rose_df.index[0]) if len(rose_df) else str(latest_df.index[0])
+        )
+
+        if patient_id in latest_df.index:
+            history = load_history(VISITS_DIR, patient_id, latest_mtime)
+            history["Risk"] = history["PredictedRisk"].map(INV_RISK_MAP)
+
+            fig = px.line(
+                history,
+                x="VisitDate",
+                y="PredictedRisk",
+                markers=True,
+                hover_data=["Risk","SystolicBP","DiastolicBP","BS"]
+            )
+            fig.update_yaxes(tickvals=[1,2,3], ticktext=["low risk","mid risk","high risk"], range=[0.5,3.5])
+            fig.update_layout(
+                font_color="white",
+                margin=dict(l=0,r=0,t=20,b=0),
+                plot_bgcolor="rgba(0,0,0,0)",
+                paper_bgcolor="rgba(0,0,0,0)"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.warning("Patient ID not found")
+
+    st.divider()
+
 # ================= TABLE =================
 st.subheader("Filtered Data")
 st.dataframe(filtered_df)
@@ -0,0 +1,117 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+from sklearn.covariance import MinCovDet
+
+# ================= SETTINGS =================
+NUMERIC_COLS = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
+OUTLIER_COLS = ["OutlierMask","MahalDist","MultiOutlier"]
+
+IQR_FACTOR = 1.5
+SUPPORT_FRACTION = 0.9   # porsi data yang dipakai MCD untuk estimasi robust
+QUANTILE = 0.975         # batas chi2 untuk outlier multivariat
+RIDGE = 0.05             # regularisasi untuk kolom yang hampir konstan (mis. BodyTemp)
+MAX_FIT_ROWS = 5000      # MCD di-fit pada sampel, jarak dihitung untuk semua baris
+
+
+# ================= UNIVARIATE =================
+def iqr_mask(df, cols=NUMERIC_COLS):
+    """Bitmask of 1.5×IQR outliers; bit i is set when ``cols[i]`` is an outlier."""
+    values = df[cols].to_numpy(dtype=np.float64)
+    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    outside = (values < q1 - IQR_FACTOR * iqr) | (values > q3 + IQR_FACTOR * iqr)
+
+    bits = (1 << np.arange(len(cols))).astype(np.uint8)
+    return (outside * bits).sum(axis=1).astype(np.uint8)
+
+
+def column_flags(mask, cols=NUMERIC_COLS):
+    """Expand an ``OutlierMask`` column into one boolean column per variable."""
+    mask = np.asarray(mask)
+    return pd.DataFrame({c: (mask >> i) & 1 == 1 for i, c in enumerate(cols)})
+
+
+# ================= MULTIVARIATE =================
+def robust_distance(X, seed=0):
+    """Mahalanobis distance of every row under a robust (MCD) covariance."""
+    rng = np.random.default_rng(seed)
+    fit = X if len(X) <= MAX_FIT_ROWS else X[rng.choice(len(X), MAX_FIT_ROWS, replace=False)]
+
+    mcd = MinCovDet(support_fraction=SUPPORT_FRACTION, random_state=seed).fit(fit)
+    cov = mcd.covariance_ + np.diag(RIDGE * fit.var(axis=0))
+    precision = np.linalg.pinv(cov)
+
+    centered = X - mcd.location_
+    d2 = np.einsum("ij,jk,ik->i", centered, precision, centered)
+    return np.sqrt(np.maximum(d2, 0))
+
+
+def add_outlier_columns(df, cols=NUMERIC_COLS, group="RiskLevel"):
+    """Return ``df`` with OutlierMask, MahalDist and MultiOutlier columns.
+
+    Distances are computed per RiskLevel so each class is judged against
+    its own robust centre and spread.
+    """
+    out = df.copy()
+    out["OutlierMask"] = iqr_mask(df, cols)
+
+    dist = np.zeros(len(df), dtype=np.float32)
+    codes, _ = pd.factorize(df[group])
+    values = df[cols].to_numpy(dtype=np.float64)
+
+    for code in np.unique(codes):
+        rows = np.flatnonzero(codes == code)
+        if len(rows) > len(cols):
+            dist[rows] = robust_distance(values[rows])
+
+    out["MahalDist"] = dist
+    out["MultiOutlier"] = dist > np.sqrt(chi2.ppf(QUANTILE, len(cols)))
+    return out
+
+
+# ================= CACHE =================
+def dataset_version(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def settings_version():
+    """Detection settings stored with cached flags; changing any of them invalidates the cache."""
+    return f"iqr={IQR_FACTOR};support={SUPPORT_FRACTION};q={QUANTILE};ridge={RIDGE};fit={MAX_FIT_ROWS}"
+
+
+def sidecar_path(path):
+    root, _ = os.path.splitext(path)
+    return f"{root}.outliers.npz"
+
+
+def load_with_outliers(path):
+    """Read a CSV with its outlier columns, recomputed only when the file changes.
+
+    The flags are kept in ``<name>.outliers.npz`` next to the CSV together
+    with the content hash and detection settings they were computed from.
+    """
+    df = pd.read_csv(path)
+    version = f"{dataset_version(path)}:{settings_version()}"
+    sidecar = sidecar_path(path)
+
+    if os.path.exists(sidecar):
+        with np.load(sidecar) as cached:
+            if str(cached["version"]) == version and len(cached["OutlierMask"]) == len(df):
+                for c in OUTLIER_COLS:
+                    df[c] = cached[c]
+                return df
+
+    df = add_outlier_columns(df)
+    try:
+        np.savez(sidecar, version=version, **{c: df[c].to_numpy() for c in OUTLIER_COLS})
+    except OSError:
+        pass
+    return df
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+
+import pandas as pd
+
+import outliers
+
+# ================= LAYOUT =================
+# <root>/site=<site>/part.parquet
+# <root>/site=<site>/month=<YYYY-MM>/part.parquet
+# <root>/_partitions.json  -> ringkasan per partisi (rows, min/max/sum, RiskLevel)
+METADATA_FILE = "_partitions.json"
+
+NUMERIC_COLS = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
+RISK_LEVELS = ["low risk","mid risk","high risk"]
+
+
+def summarize(df):
+    """Summary metadata for one partition."""
+    risk = df["RiskLevel"].value_counts()
+    return {
+        "rows": int(len(df)),
+        "min": {c: float(df[c].min()) for c in NUMERIC_COLS},
+        "max": {c: float(df[c].max()) for c in NUMERIC_COLS},
+        "sum": {c: float(df[c].sum()) for c in NUMERIC_COLS},
+        "risk": {level: int(risk.get(level, 0)) for level in RISK_LEVELS},
+    }
+
+
+def write_partitioned(df, root, site_col="Site", month_col=None):
+    """Split ``df`` by site (and month of ``month_col``) and write metadata."""
+    if site_col not in df.columns:
+        raise ValueError(f"Column {site_col!r} not found; cannot partition by site")
+
+    # flag outlier dihitung sekali saat ingest dan disimpan di tiap partisi
+    if not set(outliers.OUTLIER_COLS) <= set(df.columns):
+        df = outliers.add_outlier_columns(df)
+
+    # baris tanpa site/tanggal tidak punya partisi; tolak daripada hilang diam-diam
+    for col in [site_col] + ([month_col] if month_col is not None else []):
+        missing = int(df[col].isna().sum())
+        if missing:
+            raise ValueError(f"{missing} rows have no {col}; fill or drop them before partitioning")
+
+    keys = [df[site_col].astype(str)]
+    if month_col is not None:
+        keys.append(pd.to_datetime(df[month_col]).dt.strftime("%Y-%m"))
+
+    partitions = []
+    for key, part in df.groupby(keys, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        site = key[0]
+        month = key[1] if month_col is not None else None
+
+        rel = f"site={site}" if month is None else f"site={site}/month={month}"
+        os.makedirs(os.path.join(root, rel), exist_ok=True)
+        path = f"{rel}/part.parquet"
+        part.drop(columns=[site_col]).to_parquet(os.path.join(root, path), index=False)
+
+        partitions.append({"path": path, "site": site, "month": month, **summarize(part)})
+
+    with open(os.path.join(root, METADATA_FILE), "w") as f:
+        json.dump({"partitions": partitions}, f, indent=1)
+    return partitions
+
+
+def has_partitions(root):
+    return os.path.exists(os.path.join(root, METADATA_FILE))
+
+
+def load_metadata(root):
+    with open(os.path.join(root, METADATA_FILE)) as f:
+        return json.load(f)["partitions"]
+
+
+def csv_metadata(path, site="all"):
+    """Treat a flat CSV as a single partition so the app has one code path."""
+    return [{"path": path, "site": site, "month": None, **summarize(pd.read_csv(path))}]
+
+
+def partition_keys(path):
+    """Hive-style ``key=value`` segments of a partition path."""
+    return dict(seg.split("=", 1) for seg in path.split("/")[:-1] if "=" in seg)
+
+
+def read_partition(root, path, site_col="Site"):
+    full = os.path.join(root, path)
+    if full.endswith(".csv"):
+        return outliers.load_with_outliers(full)
+    df = pd.read_parquet(full)
+
+    # fence IQR harus dari seluruh dataset, bukan dari satu partisi
+    missing = [c for c in outliers.OUTLIER_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Partition {path} has no outlier columns {missing}; rewrite it with write_partitioned")
+
+    # Site tidak disimpan di file partisi; kembalikan dari path
+    site = partition_keys(path).get("site")
+    if site is not None and site_col not in df.columns:
+        df.insert(0, site_col, site)
+    return df
+
+
+# ================= PRUNING =================
+def select_sites(partitions, sites):
+    sites = set(sites)
+    return [p for p in partitions if p["site"] in sites]
+
+
+def months(partitions):
+    return sorted({p["month"] for p in partitions if p.get("month")})
+
+
+def select_months(partitions, first, last):
+    """Partitions whose month lies in [first, last] (YYYY-MM strings)."""
+    return [p for p in partitions if p.get("month") and first <= p["month"] <= last]
+
+
+def bounds(partitions, col):
+    """Overall (min, max) of ``col`` over partitions, from metadata only."""
+    return (
+        min(p["min"][col] for p in partitions),
+        max(p["max"][col] for p in partitions),
+    )
+
+
+def prune(partitions, ranges):
+    """Split partitions by how they relate to ``ranges`` ({col: (lo, hi)}).
+
+    Returns (full, partial): ``full`` partitions lie entirely inside every
+    range and need no row filtering; ``partial`` overlap some range and must
+    be read and filtered. Partitions outside any range are dropped.
+    """
+    full, partial = [], []
+    for p in partitions:
+        overlaps = all(p["max"][c] >= lo and p["min"][c] <= hi for c, (lo, hi) in ranges.items())
+        if not overlaps:
+            continue
+        inside = all(p["min"][c] >= lo and p["max"][c] <= hi for c, (lo, hi) in ranges.items())
+        (full if inside else partial).append(p)
+    return full, partial
+
+
+def load_filtered(root, full, partial, ranges, reader=read_partition):
+    frames = [reader(root, p["path"]) for p in full]
+    for p in partial:
+        part = reader(root, p["path"])
+        mask = pd.Series(True, index=part.index)
+        for c, (lo, hi) in ranges.items():
+            mask &= part[c].between(lo, hi)
+        frames.append(part[mask])
+
+    if not frames:
+        return pd.DataFrame(columns=NUMERIC_COLS + ["RiskLevel"])
+    return pd.concat(frames, ignore_index=len(frames) > 1)
+
+
+def kpis(full, partial_df):
+    """Row count, column means and RiskLevel counts.
+
+    Fully matching partitions are answered from metadata; only the rows of
+    partially matching partitions are aggregated.
+    """
+    rows = sum(p["rows"] for p in full) + len(partial_df)
+    sums = {c: sum(p["sum"][c] for p in full) + float(partial_df[c].sum()) for c in NUMERIC_COLS}
+    risk = partial_df["RiskLevel"].value_counts()
+    counts = {level: sum(p["risk"][level] for p in full) + int(risk.get(level, 0)) for level in RISK_LEVELS}
+
+    return {
+        "rows": rows,
+        "mean": {c: sums[c] / rows if rows else float("nan") for c in NUMERIC_COLS},
+        "risk": counts,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a site/month partitioned dataset")
+    parser.add_argument("csv", help="input CSV with a site column")
+    parser.add_argument("root", help="output directory, e.g. data")
+    parser.add_argument("--site-col", default="Site")
+    parser.add_argument("--month-col", default=None, help="date column used for month partitions")
+    args = parser.parse_args()
+
+    written = write_partitioned(pd.read_csv(args.csv), args.root, args.site_col, args.month_col)
+    print(f"Wrote {len(written)} partitions to {args.root}")
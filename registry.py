@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from explain import LABEL_MAP
+from outliers import dataset_version
+
+# ================= LAYOUT =================
+# <root>/<version>/model.joblib
+# <root>/<version>/meta.json     -> feature names, label map, hash data training
+# <root>/CURRENT                 -> versi yang sedang dipromosikan
+# <root>/promotions.json         -> riwayat promosi (untuk rollback)
+# <root>/predictions.jsonl       -> versi yang melayani tiap prediksi
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+PROMOTIONS_FILE = "promotions.json"
+PREDICTIONS_FILE = "predictions.jsonl"
+FALLBACK_MODEL = "dt_joblib"
+
+Served = namedtuple("Served", ["version", "model", "meta"])
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ================= REGISTRY =================
+def list_versions(root):
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        d for d in os.listdir(root)
+        if os.path.exists(os.path.join(root, d, META_FILE))
+    )
+
+
+def register(root, model, data_path=None, label_map=LABEL_MAP, version=None):
+    """Store ``model`` as a new version. It is not served until promoted."""
+    versions = list_versions(root)
+    if version is None:
+        version = f"v{len(versions) + 1:04d}"
+    if version in versions:
+        raise ValueError(f"Version {version} already exists")
+
+    path = os.path.join(root, version)
+    tmp = f"{path}.tmp"
+    # sisa register yang terputus
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    joblib.dump(model, os.path.join(tmp, MODEL_FILE))
+
+    meta = {
+        "version": version,
+        "feature_names": [str(f) for f in model.feature_names_in_],
+        "classes": [int(c) for c in model.classes_],
+        "label_map": {str(k): v for k, v in label_map.items()},
+        "data_hash": dataset_version(data_path) if data_path else None,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(os.path.join(tmp, META_FILE), "w") as f:
+        json.dump(meta, f, indent=1)
+
+    os.replace(tmp, path)
+    return version
+
+
+def current_version(root):
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def promotions(root):
+    try:
+        with open(os.path.join(root, PROMOTIONS_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def promotion_stack(root):
+    """Versions that rollback walks back through, most recent last.
+
+    Promotions push a version and rollbacks pop one, so rolling back twice
+    goes two versions back instead of returning to the one just left.
+    """
+    stack = []
+    for h in promotions(root):
+        if h.get("rollback"):
+            stack.pop()
+        elif not stack or stack[-1] != h["version"]:
+            stack.append(h["version"])
+    return stack
+
+
+def _record(root, version, **extra):
+    entry = {"version": version, "at": time.strftime("%Y-%m-%dT%H:%M:%S"), **extra}
+    _write_atomic(os.path.join(root, PROMOTIONS_FILE), json.dumps(promotions(root) + [entry], indent=1))
+    _write_atomic(os.path.join(root, CURRENT_FILE), version)
+
+
+def promote(root, version):
+    if version not in list_versions(root):
+        raise ValueError(f"Unknown version {version}")
+    _record(root, version)
+
+
+def rollback(root):
+    """Serve the version that was promoted before the current one."""
+    stack = promotion_stack(root)
+    if len(stack) < 2:
+        raise ValueError("No earlier version to roll back to")
+    _record(root, stack[-2], rollback=True)
+    return stack[-2]
+
+
+def load_version(root, version):
+    path = os.path.join(root, version)
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    meta["label_map"] = {int(k): v for k, v in meta["label_map"].items()}
+    return Served(version, joblib.load(os.path.join(path, MODEL_FILE)), meta)
+
+
+def log_prediction(root, version, inputs, prediction):
+    if not os.path.isdir(root):
+        return
+    record = {"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "version": version, "inputs": inputs, "prediction": prediction}
+    with open(os.path.join(root, PREDICTIONS_FILE), "a") as f:
+        f.write(json.dumps(record, default=float) + "\n")
+
+
+# ================= SERVING =================
+def warm_up(model):
+    """Run one prediction so the first real request doesn't pay for it."""
+    X = pd.DataFrame(np.zeros((1, len(model.feature_names_in_))), columns=model.feature_names_in_)
+    model.predict(X)
+
+
+class ModelServer:
+    """Serves the promoted model and hot-swaps it when CURRENT changes.
+
+    New versions are loaded and warmed in a background thread and then
+    published with a single reference assignment, so callers that already
+    took ``active`` keep predicting with the version they started with.
+    """
+
+    def __init__(self, root, fallback=FALLBACK_MODEL, poll_interval=2.0):
+        self.root = root
+        self.fallback = fallback
+        self.poll_interval = poll_interval
+        self.error = None
+        self._failed = None
+        self.active = self._start()
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="model-registry-watch", daemon=True)
+        self._thread.start()
+
+    def _start(self):
+        """Load CURRENT, falling back to earlier promotions and then the fallback model."""
+        current = current_version(self.root)
+        earlier = [v for v in reversed(promotion_stack(self.root)) if v != current]
+        for version in [current] + earlier + [None]:
+            try:
+                served = self._load(version)
+                warm_up(served.model)
+                return served
+            except Exception as e:
+                if version is None:
+                    raise
+                if self.error is None:
+                    self.error = f"{version}: {e!r}"
+                    self._failed = version
+
+    def _load(self, version):
+        if version is None:
+            model = joblib.load(self.fallback)
+            meta = {
+                "version": self.fallback,
+                "feature_names": [str(f) for f in model.feature_names_in_],
+                "label_map": dict(LABEL_MAP),
+            }
+            return Served(self.fallback, model, meta)
+        return load_version(self.root, version)
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            version = current_version(self.root)
+            if version == self.active.version:
+                # mis. rollback setelah promosi versi rusak
+                self.error = None
+                self._failed = None
+                continue
+            if version is None or version == self._failed:
+                continue
+            try:
+                served = self._load(version)
+                warm_up(served.model)
+            except Exception as e:  # versi rusak: tetap layani versi lama
+                self.error = f"{version}: {e!r}"
+                self._failed = version
+                continue
+            self.error = None
+            self._failed = None
+            self.active = served
+
+    def stop(self):
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local model registry")
+    parser.add_argument("root", help="registry directory, e.g. models")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    reg = sub.add_parser("register", help="add a joblib model as a new version")
+    reg.add_argument("model")
+    reg.add_argument("--data", help="training data file, hashed into the metadata")
+    reg.add_argument("--promote", action="store_true")
+    pro = sub.add_parser("promote", help="serve a registered version")
+    pro.add_argument("version")
+    sub.add_parser("rollback", help="serve the previously promoted version")
+    sub.add_parser("list", help="list versions")
+    args = parser.parse_args()
+
+    if args.cmd == "register":
+        version = register(args.root, joblib.load(args.model), data_path=args.data)
+        print(f"Registered {version}")
+        if args.promote:
+            promote(args.root, version)
+            print(f"Promoted {version}")
+    elif args.cmd == "promote":
+        promote(args.root, args.version)
+        print(f"Promoted {args.version}")
+    elif args.cmd == "rollback":
+        print(f"Rolled back to {rollback(args.root)}")
+    else:
+        current = current_version(args.root)
+        for v in list_versions(args.root):
+            print(("* " if v == current else "  ") + v)
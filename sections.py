@@ -0,0 +1,208 @@
+from functools import partial
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from alerts import ALERT_RULES, alert_summary, compile_rules, evaluate, flagged_patients
+from explain import leaf_paths, to_model_frame, top_paths
+from outliers import column_flags
+
+# ================= SECTION BUILDERS =================
+# fungsi murni (tanpa st.*) sehingga bisa dihitung paralel & di-cache
+NUMERIC_COLS = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
+RISK_BOX_COLS = ["Age","BS","SystolicBP","DiastolicBP"]
+
+RISK_MAP = {
+    "low risk":1,
+    "mid risk":2,
+    "high risk":3
+}
+
+COMPILED_RULES = compile_rules(ALERT_RULES)
+
+COLOR_MAP = {
+    "low risk":"#2ecc71",
+    "mid risk":"#f39c12",
+    "high risk":"#e74c3c"
+}
+
+
+def pie_figure(df):
+    fig = px.pie(
+        df,
+        names="RiskLevel",
+        color="RiskLevel",
+        color_discrete_map=COLOR_MAP
+    )
+
+    fig.update_layout(
+        font_color="white",
+        margin=dict(l=0,r=0,t=20,b=0),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        legend=dict(
+            orientation="h",
+            yanchor="top",
+            y=-0.15,
+            xanchor="center",
+            x=0.5
+        )
+    )
+
+    fig.update_traces(textfont_color="white")
+    return fig
+
+
+def risk_box_figure(df, col):
+    fig = px.box(
+        df,
+        x="RiskLevel",
+        y=col,
+        color="RiskLevel",
+        color_discrete_map=COLOR_MAP,
+        category_orders={"RiskLevel":["low risk","mid risk","high risk"]}
+    )
+
+    fig.update_layout(font_color="white", margin=dict(l=0,r=0,t=20,b=0))
+    return fig
+
+
+def outlier_box_figure(df, col):
+    # titik = flag OutlierMask (fence IQR seluruh dataset), sama dengan Outlier Insights
+    flagged = df.loc[column_flags(df["OutlierMask"], NUMERIC_COLS)[col].to_numpy(), col]
+    fig = go.Figure([
+        go.Box(y=df[col], name=col, boxpoints=False),
+        go.Scatter(x=[col] * len(flagged), y=flagged, mode="markers", name="Outlier", marker_color="#e74c3c"),
+    ])
+
+    fig.update_layout(
+        title=col,
+        font_color="white",
+        margin=dict(l=0,r=0,t=30,b=0),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        showlegend=False
+    )
+
+    fig.update_traces(
+        marker=dict(size=5)
+    )
+    return fig
+
+
+def outlier_insights(df):
+    """(column, % outliers) sorted from most to least, from precomputed flags."""
+    flags = column_flags(df["OutlierMask"], NUMERIC_COLS)
+    insights = list(zip(NUMERIC_COLS, flags.mean().to_numpy() * 100))
+
+    # sorting berdasarkan outlier terbesar
+    insights.sort(key=lambda x: x[1], reverse=True)
+    return insights
+
+
+def histogram_figure(df, col):
+    fig = px.histogram(df, x=col, nbins=20)
+
+    fig.update_traces(
+        marker=dict(
+            color="#5DADE2",
+            line=dict(color="white", width=1.2)
+        )
+    )
+
+    fig.update_layout(
+        title=col,
+        font_color="white",
+        margin=dict(l=0,r=0,t=30,b=0),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)"
+    )
+    return fig
+
+
+def get_skew_label(skew):
+    if skew > 0.5:
+        return "right-skewed (lebih banyak nilai rendah)"
+    elif skew < -0.5:
+        return "left-skewed (lebih banyak nilai tinggi)"
+    else:
+        return "relatively symmetric"
+
+
+def distribution_texts(df):
+    texts = []
+
+    for col in NUMERIC_COLS:
+        mean = df[col].mean()
+        median = df[col].median()
+        skew = df[col].skew()
+
+        texts.append(f"""
+**{col}**
+- Mean = {mean:.2f}  
+- Median = {median:.2f}  
+- Distribution shape = {get_skew_label(skew)}
+""")
+    return texts
+
+
+def correlation(df):
+    df_encoded = df[NUMERIC_COLS + ["RiskLevel"]].copy()
+    df_encoded["RiskLevel"] = df_encoded["RiskLevel"].map(RISK_MAP)
+    return df_encoded.corr()
+
+
+def heatmap_figure(df):
+    fig = px.imshow(
+        correlation(df),
+        text_auto=".2f",
+        color_continuous_scale="RdBu_r",
+        aspect="auto",
+        height=600
+    )
+
+    fig.update_traces(
+        textfont=dict(
+            color="black",
+            size=14,
+            family="Arial Black"
+        )
+    )
+
+    fig.update_layout(
+        font_color="white",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)"
+    )
+    return fig
+
+
+def patient_alerts(df):
+    """(patients per rule, flagged rows with most alerts first)."""
+    flags = evaluate(COMPILED_RULES, df)
+    flagged = flagged_patients(df, flags, COMPILED_RULES)
+    return alert_summary(flags, COMPILED_RULES), flagged.sort_values("AlertCount", ascending=False)
+
+
+def common_paths(df, served):
+    model = served.model
+    return top_paths(model, to_model_frame(df), k=3, paths=leaf_paths(model), label_map=served.meta["label_map"])
+
+
+# nama section -> builder(df); dipakai main.py dan warm-up
+SECTIONS = {
+    "pie": pie_figure,
+    **{f"risk_box_{c}": partial(risk_box_figure, col=c) for c in RISK_BOX_COLS},
+    **{f"outlier_box_{c}": partial(outlier_box_figure, col=c) for c in NUMERIC_COLS},
+    "outlier_insights": outlier_insights,
+    **{f"hist_{c}": partial(histogram_figure, col=c) for c in NUMERIC_COLS},
+    "distribution_texts": distribution_texts,
+    "corr": correlation,
+    "heatmap": heatmap_figure,
+    "patient_alerts": patient_alerts,
+}
+
+# section yang juga bergantung pada model -> builder(df, served); served = registry.Served
+MODEL_SECTIONS = {
+    "common_paths": common_paths,
+}
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from alerts import (
+    ALERT_RULES, AlertEngine, alert_codes, code_labels, compile_rules, evaluate, flagged_patients,
+    population_alerts,
+)
+
+
+def sample():
+    return pd.DataFrame({
+        "Age": [25, 35, 40, 22],
+        "SystolicBP": [120, 140, 140, 90],
+        "DiastolicBP": [80, 90, 70, 60],
+        "BS": [7.0, 13.0, 6.0, 9.0],
+        "BodyTemp": [98.0, 98.0, 101.0, 98.0],
+        "HeartRate": [70, 80, 90, 76],
+    })
+
+
+def test_evaluate_threshold_and_combination_rules():
+    compiled = compile_rules(ALERT_RULES)
+    flags = evaluate(compiled, sample())
+    col = {name: j for j, name in enumerate(compiled["names"])}
+
+    assert flags[:, col["high_bs"]].tolist() == [False, True, False, True]
+    assert flags[:, col["hypertension"]].tolist() == [False, True, False, False]
+    assert flags[:, col["bp_and_bs"]].tolist() == [False, True, False, False]
+    assert flags[:, col["high_temp"]].tolist() == [False, False, True, False]
+
+
+def test_compile_rules_requires_value():
+    with pytest.raises(ValueError, match="value"):
+        compile_rules([{"name": "x", "column": "BS", "op": ">"}])
+
+
+def test_compile_rules_rejects_unknown_reference():
+    with pytest.raises(ValueError, match="unknown rule"):
+        compile_rules([{"name": "x", "all": ["missing"]}])
+
+
+def test_alert_engine_only_evaluates_new_rows():
+    df = sample()
+    engine = AlertEngine()
+    engine.update(df.iloc[:2])
+    assert engine.n_seen == 2
+
+    new_flags = engine.append(df.iloc[2:])
+    assert new_flags.shape == (2, len(ALERT_RULES))
+    np.testing.assert_array_equal(engine.flags, evaluate(engine.compiled, df))
+
+    engine.update(df)  # tidak ada baris baru
+    assert engine.n_seen == 4
+
+
+def test_code_labels_match_per_row_join():
+    compiled = compile_rules(ALERT_RULES)
+    rng = np.random.default_rng(0)
+    flags = rng.random((500, len(ALERT_RULES))) < 0.4
+    labels = np.array(compiled["labels"], dtype=object)
+
+    expected = [", ".join(labels[row]) for row in flags]
+    assert code_labels(alert_codes(flags), compiled).tolist() == expected
+
+
+def test_flagged_patients_keeps_only_flagged_rows():
+    compiled = compile_rules(ALERT_RULES)
+    df = sample()
+    out = flagged_patients(df, evaluate(compiled, df), compiled)
+    assert out.index.tolist() == [1, 2, 3]
+    assert out["Alerts"].iloc[2] == "Blood Sugar tinggi"
+
+
+def test_population_alerts_use_rule_thresholds_and_units():
+    compiled = compile_rules(ALERT_RULES)
+    df = sample()  # rata-rata: BS 8.75, sistolik 122.5, diastolik 75, suhu 98.75 °F
+    assert population_alerts(compiled, df) == ["Blood Sugar tinggi"]
+
+    df["BodyTemp"] = 100.0
+    assert population_alerts(compiled, df) == ["Blood Sugar tinggi", "Suhu tubuh tinggi"]
+
+
+def test_alert_engine_appends_without_losing_batches():
+    df = pd.concat([sample()] * 5, ignore_index=True)
+    engine = AlertEngine()
+    for start in range(0, len(df), 3):
+        engine.append(df.iloc[start:start + 3])
+    assert engine.n_seen == len(df)
+    np.testing.assert_array_equal(engine.flags, evaluate(engine.compiled, df))
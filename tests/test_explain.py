@@ -0,0 +1,69 @@
+import os
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from explain import LABEL_MAP, decision_paths, explain_batch, leaf_paths, to_model_frame, top_paths
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def model():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return joblib.load(os.path.join(ROOT, "dt_joblib"))
+
+
+@pytest.fixture(scope="module")
+def X():
+    return to_model_frame(pd.read_csv(os.path.join(ROOT, "maternal.csv")))
+
+
+def test_paths_end_in_the_leaf_the_model_applies(model, X):
+    paths = decision_paths(model, X)
+    tree = model.tree_
+    last = paths.groupby("sample").tail(1)
+
+    child = np.where(last["direction"] == "<=", tree.children_left[last["node"]], tree.children_right[last["node"]])
+    np.testing.assert_array_equal(child, model.apply(X)[last["sample"]])
+
+
+def test_direction_follows_the_path_near_thresholds(model, X):
+    # nilai tepat di sekitar threshold: float64 vs float32 bisa berbeda arah
+    tree = model.tree_
+    rows = []
+    for node in np.flatnonzero(tree.feature >= 0):
+        for eps in (-1e-7, 0.0, 1e-7):
+            row = X.iloc[0].to_numpy(dtype=np.float64).copy()
+            row[tree.feature[node]] = tree.threshold[node] + eps
+            rows.append(row)
+    near = pd.DataFrame(rows, columns=X.columns)
+
+    paths = decision_paths(model, near)
+    indicator = model.decision_path(near).tocsr()
+    for sample, steps in paths.groupby("sample"):
+        visited = set(indicator[sample].indices)
+        for node, direction in zip(steps["node"], steps["direction"]):
+            child = tree.children_left[node] if direction == "<=" else tree.children_right[node]
+            assert child in visited
+
+
+def test_explain_batch_matches_predict(model, X):
+    out = explain_batch(model, X)
+    expected = pd.Series(model.predict(X)).map(LABEL_MAP).to_numpy()
+    np.testing.assert_array_equal(out["Prediction"].to_numpy(), expected)
+
+
+def test_top_paths_counts_every_row(model, X):
+    top = top_paths(model, X, k=1000, paths=leaf_paths(model))
+    assert top["Patients"].sum() == len(X)
+
+
+def test_top_paths_use_given_label_map(model, X):
+    label_map = {1: "low", 2: "mid", 3: "high"}
+    out = top_paths(model, X, k=2, label_map=label_map)
+    assert set(out["Prediction"]) <= set(label_map.values())
@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import outliers
+from outliers import NUMERIC_COLS, column_flags, iqr_mask, load_with_outliers, sidecar_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_iqr_mask_matches_pandas_quantile_loop():
+    df = pd.read_csv(os.path.join(ROOT, "maternal.csv"))
+    flags = column_flags(iqr_mask(df), NUMERIC_COLS)
+
+    for col in NUMERIC_COLS:
+        q1 = df[col].quantile(0.25)
+        q3 = df[col].quantile(0.75)
+        iqr = q3 - q1
+        expected = (df[col] < q1 - 1.5 * iqr) | (df[col] > q3 + 1.5 * iqr)
+        np.testing.assert_array_equal(flags[col].to_numpy(), expected.to_numpy())
+
+
+def test_sidecar_is_reused_until_csv_changes(tmp_path):
+    path = str(tmp_path / "maternal.csv")
+    shutil.copy(os.path.join(ROOT, "maternal.csv"), path)
+
+    first = load_with_outliers(path)
+    assert os.path.exists(sidecar_path(path))
+    stamp = os.path.getmtime(sidecar_path(path))
+    np.testing.assert_array_equal(load_with_outliers(path)["OutlierMask"], first["OutlierMask"])
+    assert os.path.getmtime(sidecar_path(path)) == stamp
+
+    # satu baris diubah menjadi outlier ekstrem -> flag harus dihitung ulang
+    df = pd.read_csv(path)
+    df.loc[0, "BS"] = 1000
+    df.to_csv(path, index=False)
+    changed = load_with_outliers(path)
+    assert column_flags(changed["OutlierMask"], NUMERIC_COLS)["BS"].iloc[0]
+    assert len(changed) == len(df)
+
+
+def test_sidecar_is_invalidated_by_settings(tmp_path, monkeypatch):
+    path = str(tmp_path / "maternal.csv")
+    shutil.copy(os.path.join(ROOT, "maternal.csv"), path)
+    default = load_with_outliers(path)
+
+    monkeypatch.setattr(outliers, "IQR_FACTOR", 3.0)
+    wide = load_with_outliers(path)
+    np.testing.assert_array_equal(wide["OutlierMask"], iqr_mask(wide))
+    assert (wide["OutlierMask"] != default["OutlierMask"]).any()
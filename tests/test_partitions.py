@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import partitions as parts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RANGE_COLS = ["Age","BS","SystolicBP","DiastolicBP"]
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    df = pd.read_csv(os.path.join(ROOT, "maternal.csv"))
+    df["Site"] = rng.choice(["a", "b", "c"], len(df))
+    df["VisitDate"] = pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 90, len(df)), unit="D")
+
+    root = str(tmp_path_factory.mktemp("data"))
+    meta = parts.write_partitioned(df, root, month_col="VisitDate")
+    return df, root, meta
+
+
+def test_read_partition_restores_site(dataset):
+    df, root, meta = dataset
+    for p in meta:
+        part = parts.read_partition(root, p["path"])
+        assert (part["Site"] == p["site"]).all()
+        assert len(part) == p["rows"]
+
+
+def test_write_partitioned_rejects_missing_site(dataset, tmp_path):
+    df = dataset[0].copy()
+    df.loc[0, "Site"] = None
+    with pytest.raises(ValueError, match="no Site"):
+        parts.write_partitioned(df, str(tmp_path))
+
+
+def test_pruned_load_and_kpis_match_brute_force(dataset):
+    df, root, meta = dataset
+    cache = {p["path"]: parts.read_partition(root, p["path"]) for p in meta}
+    rng = np.random.default_rng(1)
+    month_list = parts.months(meta)
+
+    for _ in range(200):
+        ranges = {}
+        for c in rng.choice(RANGE_COLS, rng.integers(1, len(RANGE_COLS) + 1), replace=False):
+            lo, hi = np.sort(rng.uniform(df[c].min() - 1, df[c].max() + 1, 2))
+            ranges[c] = (lo, hi)
+        sites = list(rng.choice(["a", "b", "c"], rng.integers(1, 4), replace=False))
+        first, last = sorted(rng.choice(month_list, 2))
+
+        selected = parts.select_months(parts.select_sites(meta, sites), first, last)
+        full, partial = parts.prune(selected, ranges)
+        got = parts.load_filtered(root, full, partial, ranges, reader=lambda r, path: cache[path])
+        partial_df = parts.load_filtered(root, [], partial, ranges, reader=lambda r, path: cache[path])
+        summary = parts.kpis(full, partial_df)
+
+        month = df["VisitDate"].dt.strftime("%Y-%m")
+        mask = df["Site"].isin(sites) & month.between(first, last)
+        for c, (lo, hi) in ranges.items():
+            mask &= df[c].between(lo, hi)
+        expected = df[mask]
+
+        assert len(got) == len(expected) == summary["rows"]
+        if len(expected):
+            assert sorted(got["Site"]) == sorted(expected["Site"])
+        for c in parts.NUMERIC_COLS:
+            assert np.isclose(got[c].sum(), expected[c].sum())
+            if len(expected):
+                assert np.isclose(summary["mean"][c], expected[c].mean())
+        counts = expected["RiskLevel"].value_counts()
+        assert summary["risk"] == {level: int(counts.get(level, 0)) for level in parts.RISK_LEVELS}
@@ -0,0 +1,96 @@
+import os
+import time
+import warnings
+
+import joblib
+import pytest
+
+import registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FALLBACK = os.path.join(ROOT, "dt_joblib")
+
+
+@pytest.fixture(scope="module")
+def model():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return joblib.load(FALLBACK)
+
+
+@pytest.fixture
+def root(tmp_path, model):
+    root = str(tmp_path / "models")
+    for _ in range(3):
+        registry.promote(root, registry.register(root, model))
+    return root
+
+
+def test_consecutive_rollbacks_walk_back_the_history(root):
+    assert registry.current_version(root) == "v0003"
+    assert registry.rollback(root) == "v0002"
+    assert registry.rollback(root) == "v0001"
+    assert registry.current_version(root) == "v0001"
+    with pytest.raises(ValueError, match="No earlier version"):
+        registry.rollback(root)
+
+
+def test_rollback_after_new_promotion(root):
+    registry.rollback(root)
+    registry.promote(root, "v0003")
+    assert registry.rollback(root) == "v0002"
+    assert registry.rollback(root) == "v0001"
+
+
+def test_register_replaces_leftover_tmp_dir(root, model):
+    os.makedirs(os.path.join(root, "v0004.tmp"))
+    assert registry.register(root, model) == "v0004"
+    assert not os.path.exists(os.path.join(root, "v0004.tmp"))
+
+
+def test_server_falls_back_when_current_is_broken(root):
+    with open(os.path.join(root, "v0003", registry.MODEL_FILE), "wb") as f:
+        f.write(b"broken")
+
+    server = registry.ModelServer(root, fallback=FALLBACK)
+    try:
+        assert server.active.version == "v0002"
+        assert server.error.startswith("v0003")
+    finally:
+        server.stop()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_server_hot_swaps_promotions_and_skips_broken(root, model):
+    server = registry.ModelServer(root, fallback=FALLBACK, poll_interval=0.02)
+    try:
+        assert server.active.version == "v0003"
+
+        registry.promote(root, registry.register(root, model))
+        assert wait_for(lambda: server.active.version == "v0004")
+
+        registry.rollback(root)
+        assert wait_for(lambda: server.active.version == "v0003")
+
+        broken = registry.register(root, model)
+        with open(os.path.join(root, broken, registry.MODEL_FILE), "wb") as f:
+            f.write(b"broken")
+        registry.promote(root, broken)
+        assert wait_for(lambda: server.error is not None)
+        assert server.active.version == "v0003"
+        assert server.error.startswith(broken)
+
+        # rollback dari versi rusak -> error dibersihkan
+        registry.rollback(root)
+        assert wait_for(lambda: server.error is None)
+        assert server.active.version == "v0003"
+    finally:
+        server.stop()
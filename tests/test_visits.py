@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from visits import VITALS, VisitStore
+
+
+def batch(rng, patients, dates):
+    n = len(patients)
+    return pd.DataFrame({
+        "PatientID": patients,
+        "VisitDate": dates,
+        "Age": rng.integers(18, 45, n),
+        "SystolicBP": rng.integers(90, 160, n),
+        "DiastolicBP": rng.integers(60, 100, n),
+        "BS": rng.uniform(6, 15, n).round(1),
+        "BodyTemp": rng.choice([98.0, 100.0], n),
+        "HeartRate": rng.integers(60, 90, n),
+        "PredictedRisk": rng.integers(1, 4, n),
+    })
+
+
+def brute_force_latest(store):
+    """Latest visit and the risk of the one before it, from the full log."""
+    rows = {}
+    for pid, visits in store.visits().groupby("PatientID"):
+        visits = visits.sort_values("VisitDate")
+        last = visits.iloc[-1]
+        prev = visits.iloc[-2] if len(visits) > 1 else None
+        rows[pid] = (
+            last["VisitDate"],
+            int(last["PredictedRisk"]),
+            None if prev is None else prev["VisitDate"],
+            None if prev is None else int(prev["PredictedRisk"]),
+        )
+    return rows
+
+
+@pytest.mark.filterwarnings("error")
+def test_latest_index_matches_full_log(tmp_path):
+    rng = np.random.default_rng(0)
+    store = VisitStore(str(tmp_path))
+    day = pd.Timestamp("2026-01-01")
+
+    # kunjungan biasa
+    store.append(batch(rng, ["a", "b", "c"], [day] * 3))
+    store.append(batch(rng, ["a", "b"], [day + pd.Timedelta(days=7)] * 2))
+    # backfill: kunjungan lama yang baru dikirim
+    store.append(batch(rng, ["a", "c"], [day - pd.Timedelta(days=7), day - pd.Timedelta(days=3)]))
+    # overwrite: kunjungan yang sama dikirim ulang dengan risiko lain
+    store.append(batch(rng, ["a", "b"], [day + pd.Timedelta(days=7), day]))
+    store.append(batch(rng, ["d"], [day]))
+
+    expected = brute_force_latest(store)
+    for reopened in [store, VisitStore(str(tmp_path))]:
+        latest = reopened.latest
+        assert sorted(latest.index) == sorted(expected)
+        for pid, (date, risk, prev_date, prev_risk) in expected.items():
+            row = latest.loc[pid]
+            assert row["VisitDate"] == date
+            assert row["PredictedRisk"] == risk
+            if prev_date is None:
+                assert pd.isna(row["PrevDate"]) and pd.isna(row["PrevRisk"])
+            else:
+                assert row["PrevDate"] == prev_date
+                assert row["PrevRisk"] == prev_risk
+
+
+def test_append_requires_vitals(tmp_path):
+    rng = np.random.default_rng(0)
+    visits = batch(rng, ["a"], ["2026-01-01"]).drop(columns=VITALS[:1])
+    with pytest.raises(ValueError, match="missing columns"):
+        VisitStore(str(tmp_path)).append(visits)
@@ -0,0 +1,195 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from alerts import ALERT_RULES, alert_codes, compile_rules, evaluate
+from explain import to_model_frame
+
+# ================= LAYOUT =================
+# <root>/base.parquet        -> hasil compaction, urut PatientID & VisitDate
+# <root>/log-<seq>.parquet   -> segmen append-only (satu per append)
+# <root>/latest.parquet      -> index: satu baris per pasien (kunjungan terakhir)
+VITALS = ["Age","SystolicBP","DiastolicBP","BS","BodyTemp","HeartRate"]
+KEY = ["PatientID","VisitDate"]
+COMPACT_EVERY = 30   # compaction otomatis setelah sekian segmen
+
+
+def _write_atomic(df, path):
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _normalize(visits):
+    missing = [c for c in KEY + VITALS if c not in visits.columns]
+    if missing:
+        raise ValueError(f"Visits are missing columns: {missing}")
+    out = visits.copy()
+    out["PatientID"] = out["PatientID"].astype(str)
+    out["VisitDate"] = pd.to_datetime(out["VisitDate"])
+    return out
+
+
+class VisitStore:
+    """Append-only columnar log of patient visits with a latest-state index.
+
+    The index holds each patient's most recent visit, its predicted risk and
+    the risk of the visit before it, keyed by PatientID for O(1) lookups.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._latest = None
+        self.rules = compile_rules(ALERT_RULES)
+
+    # ----- files -----
+    def segments(self):
+        return sorted(glob.glob(os.path.join(self.root, "log-*.parquet")))
+
+    def _next_seq(self):
+        segs = self.segments()
+        if not segs:
+            return 0
+        return int(os.path.basename(segs[-1])[4:-8]) + 1
+
+    @property
+    def base_path(self):
+        return os.path.join(self.root, "base.parquet")
+
+    @property
+    def latest_path(self):
+        return os.path.join(self.root, "latest.parquet")
+
+    # ----- write -----
+    def append(self, visits, model=None):
+        """Append a batch of visits, predicting risk with ``model`` if given."""
+        visits = _normalize(visits)
+        if model is not None:
+            visits["PredictedRisk"] = model.predict(to_model_frame(visits))
+        if "PredictedRisk" not in visits.columns:
+            raise ValueError("Visits need a PredictedRisk column or a model to predict it")
+        visits["PredictedRisk"] = visits["PredictedRisk"].astype(np.int8)
+        # hanya batch baru yang dievaluasi rule alert-nya
+        visits["AlertMask"] = alert_codes(evaluate(self.rules, visits))
+
+        os.makedirs(self.root, exist_ok=True)
+        seq = self._next_seq()
+        _write_atomic(visits, os.path.join(self.root, f"log-{seq:08d}.parquet"))
+        self._update_latest(visits)
+
+        if len(self.segments()) >= COMPACT_EVERY:
+            self.compact()
+        return len(visits)
+
+    def _update_latest(self, visits):
+        latest = self.latest
+        touched = latest[latest.index.isin(visits["PatientID"].unique())].reset_index()
+
+        # kandidat: kunjungan terakhir & sebelumnya yang sudah diketahui + batch baru
+        prev = touched[["PatientID","PrevDate","PrevRisk"]].dropna()
+        prev = prev.rename(columns={"PrevDate":"VisitDate", "PrevRisk":"PredictedRisk"})
+        cols = KEY + VITALS + ["PredictedRisk","AlertMask"]
+        frames = [f for f in [prev, touched[cols], visits[cols]] if len(f)]
+        cand = pd.concat(frames, ignore_index=True)
+        cand["_order"] = np.arange(len(cand))
+        cand = (
+            cand.sort_values(["PatientID","VisitDate","_order"], kind="stable")
+            .drop_duplicates(KEY, keep="last")
+        )
+
+        last_two = cand.groupby("PatientID", sort=False).tail(2)
+        is_last = ~last_two["PatientID"].duplicated(keep="last").to_numpy()
+        has_prev = last_two["PatientID"].duplicated(keep="first").to_numpy()[is_last]
+
+        new = last_two[is_last].drop(columns="_order").reset_index(drop=True)
+        new["PredictedRisk"] = new["PredictedRisk"].astype(np.int8)
+        new["AlertMask"] = new["AlertMask"].astype(np.uint64)
+        before = last_two[~is_last].set_index("PatientID")
+        # PrevRisk float (NaN = belum ada kunjungan sebelumnya)
+        new["PrevDate"] = pd.Series(pd.NaT, index=new.index, dtype="datetime64[ns]")
+        new["PrevRisk"] = pd.Series(np.nan, index=new.index, dtype=np.float64)
+        ids = new.loc[has_prev, "PatientID"]
+        new.loc[has_prev, "PrevDate"] = before.loc[ids, "VisitDate"].to_numpy(dtype="datetime64[ns]")
+        new.loc[has_prev, "PrevRisk"] = before.loc[ids, "PredictedRisk"].to_numpy(dtype=np.float64)
+
+        kept = latest[~latest.index.isin(new["PatientID"])]
+        new = new.set_index("PatientID")
+        latest = new if kept.empty else pd.concat([kept, new])
+        _write_atomic(latest.reset_index(), self.latest_path)
+        self._latest = latest
+
+    def compact(self):
+        """Merge log segments into base.parquet, keeping the last write per visit."""
+        segs = self.segments()
+        if not segs:
+            return
+        frames = [pd.read_parquet(p) for p in ([self.base_path] if os.path.exists(self.base_path) else []) + segs]
+        merged = (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(KEY, keep="last")
+            .sort_values(KEY, kind="stable")
+        )
+        _write_atomic(merged, self.base_path)
+        for p in segs:
+            os.remove(p)
+
+    # ----- read -----
+    @property
+    def latest(self):
+        if self._latest is None:
+            if os.path.exists(self.latest_path):
+                self._latest = pd.read_parquet(self.latest_path).set_index("PatientID")
+            else:
+                self._latest = pd.DataFrame(
+                    columns=KEY[1:] + VITALS + ["PredictedRisk","AlertMask","PrevDate","PrevRisk"],
+                    index=pd.Index([], name="PatientID"),
+                )
+        return self._latest
+
+    def lookup(self, patient_id):
+        """Latest vitals and predicted risk of one patient."""
+        return self.latest.loc[str(patient_id)]
+
+    def risk_rose(self):
+        """Patients whose predicted risk is higher than at their previous visit."""
+        latest = self.latest
+        return latest[latest["PredictedRisk"] > latest["PrevRisk"]]
+
+    def visits(self, patient_ids=None):
+        paths = ([self.base_path] if os.path.exists(self.base_path) else []) + self.segments()
+        filters = None if patient_ids is None else [("PatientID", "in", [str(p) for p in patient_ids])]
+        frames = [pd.read_parquet(p, filters=filters) for p in paths]
+        if not frames:
+            return pd.DataFrame(columns=KEY + VITALS + ["PredictedRisk"])
+        return (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(KEY, keep="last")
+            .sort_values(KEY, kind="stable")
+            .reset_index(drop=True)
+        )
+
+    def history(self, patient_id):
+        return self.visits([patient_id])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the patient visit store")
+    parser.add_argument("root", help="store directory, e.g. visits")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("append", help="append visits from a CSV (PatientID, VisitDate, vitals)")
+    add.add_argument("csv")
+    add.add_argument("--model", default="dt_joblib")
+    sub.add_parser("compact", help="merge log segments into base.parquet")
+    args = parser.parse_args()
+
+    store = VisitStore(args.root)
+    if args.cmd == "append":
+        import joblib
+        n = store.append(pd.read_csv(args.csv), model=joblib.load(args.model))
+        print(f"Appended {n} visits; {len(store.latest)} patients, {len(store.risk_rose())} with rising risk")
+    else:
+        store.compact()
+        print(f"Compacted into {store.base_path}")